@@ -0,0 +1,34 @@
+import numpy as np
+from _njit import njit
+
+# --- INDICATOR KERNELS ---
+@njit(cache=True, fastmath=True)
+def dual_ewma(x, alpha_fast, alpha_slow):
+    # Fast and slow ewm(adjust=False).mean() of the same series in one pass, compiled once and cached on disk
+    fast, slow = np.empty_like(x), np.empty_like(x)
+    fast[0] = slow[0] = x[0]
+    for i in range(1, x.size):
+        fast[i] = alpha_fast * x[i] + (1 - alpha_fast) * fast[i-1]
+        slow[i] = alpha_slow * x[i] + (1 - alpha_slow) * slow[i-1]
+    return fast, slow
+
+@njit(cache=True)
+def fused_indicators(high, low, close, alpha_fast, alpha_slow):
+    # Fast/slow EMA of close, bar size and True Range in a single pass over the bars (outputs keep the input dtype)
+    n = close.size
+    ema_fast, ema_slow = np.empty_like(close), np.empty_like(close)
+    size, tr = np.empty_like(close), np.empty_like(close)
+    ema_fast[0] = ema_slow[0] = close[0]
+    size[0] = high[0] - low[0]
+    tr[0] = np.nan
+    for i in range(1, n):
+        ema_fast[i] = alpha_fast * close[i] + (1 - alpha_fast) * ema_fast[i-1]
+        ema_slow[i] = alpha_slow * close[i] + (1 - alpha_slow) * ema_slow[i-1]
+        size[i] = high[i] - low[i]
+        hc, lc = abs(high[i] - close[i-1]), abs(low[i] - close[i-1])
+        # NaN anywhere propagates, like np.maximum
+        if np.isnan(size[i]) or np.isnan(hc) or np.isnan(lc):
+            tr[i] = np.nan
+        else:
+            tr[i] = max(size[i], hc, lc)
+    return ema_fast, ema_slow, size, tr
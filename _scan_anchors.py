@@ -0,0 +1,49 @@
+import numpy as np
+from _njit import njit, prange
+
+# --- 1-2-4 ANCHOR KERNEL ---
+@njit(cache=True)
+def scan_anchors(size, high, low, leg_in_mult, leg_out_mult):
+    # Every base bar i (leg-in i-1, leg-out i+1) with leg_in >= leg_in_mult*base and
+    # leg_out >= leg_out_mult*base, returned as parallel arrays: index, pristine flag, violations
+    n = size.shape[0]
+
+    # Lowest low strictly after each bar, filled in one backward pass
+    future_min = np.empty(n)
+    running = np.inf
+    for i in range(n - 1, -1, -1):
+        future_min[i] = running
+        if low[i] < running:
+            running = low[i]
+
+    # Candidate bases as one shifted-slice mask (bases run from bar 2 to n-2), then only the survivors are visited
+    base, leg_in, leg_out = size[2:n-1], size[1:n-2], size[3:]
+    idx = np.flatnonzero((base > 0) & (leg_in >= leg_in_mult * base) & (leg_out >= leg_out_mult * base)) + 2
+    pristine = future_min[idx] >= high[idx]
+    violations = np.zeros(idx.size, dtype=np.int64)
+    for k in range(idx.size):
+        # Exact piercing count only for violated bases, as one array compare over the later lows
+        if not pristine[k]:
+            i = idx[k]
+            violations[k] = (low[i+1:] < high[i]).sum()
+    return idx, pristine, violations
+
+@njit(parallel=True, cache=True)
+def scan_all(high_mat, low_mat, size_mat, leg_in_mult, leg_out_mult):
+    # Batch 1-2-4 screen over (tickers, bars) matrices, one thread per ticker: number of pristine anchors
+    # (leg_in >= leg_in_mult*base, leg_out >= leg_out_mult*base) and the bar position of the oldest one
+    n_tickers, n_bars = high_mat.shape
+    counts = np.zeros(n_tickers, dtype=np.int64)
+    oldest = np.full(n_tickers, -1, dtype=np.int64)
+    for t in prange(n_tickers):
+        high, low, size = high_mat[t], low_mat[t], size_mat[t]
+        future_min = np.inf
+        # Walk backwards so the running min of later lows is each base's pristine test (NaN gaps are skipped)
+        for i in range(n_bars - 2, 1, -1):
+            if low[i+1] < future_min:
+                future_min = low[i+1]
+            l1, l2, l4 = size[i-1], size[i], size[i+1]
+            if l2 > 0 and l1 >= leg_in_mult*l2 and l4 >= leg_out_mult*l2 and future_min >= high[i]:
+                counts[t] += 1
+                oldest[t] = i
+    return counts, oldest
@@ -0,0 +1,52 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.graph_objects as go
+
+# --- SHARED CHART BUILDER ---
+# Zone fills: pristine 1-2-4 = Cyan, everything else = Orange
+CYAN = "rgba(0, 255, 255, 0.6)"
+ORANGE = "rgba(255, 165, 0, 0.4)"
+
+def _candles(df):
+    # Only OHLC is kept, as float32: plotly ships arrays as typed binary, so this halves the candle payload
+    return df[['Open', 'High', 'Low', 'Close']].astype(np.float32)
+
+# Keyed on the bar window (length, first and last timestamp) and the live close.
+# Shared Figure object (cache_resource): st.plotly_chart only reads it
+@st.cache_resource(ttl=600, max_entries=64, show_spinner=False,
+                   hash_funcs={pd.DataFrame: lambda d: (len(d), d.index[0], d.index[-1], d['Close'].iloc[-1])})
+def build_hunter_figure(ticker, df, zones, selected_date):
+    candles = _candles(df)
+    traces = [
+        go.Candlestick(x=candles.index, open=candles['Open'], high=candles['High'], low=candles['Low'], close=candles['Close'], name="Price"),
+        go.Scattergl(x=df.index, y=df['EMA30'], line=dict(color='#00d1ff', width=2), name='EMA 30'),
+        go.Scattergl(x=df.index, y=df['EMA50'], line=dict(color='#ff9900', width=2), name='EMA 50'),
+    ]
+
+    # Shape Drawing (plain dicts, handed to the Figure in one go)
+    shapes, annotations = [], []
+    for date, x1, y0, y1, is_124, violations, l1_x, l1_y, l4_y in zip(
+            zones['Date'], zones['l4_idx'], zones['Low (Floor)'], zones['High (Ceiling)'], zones['is_124'], zones['Violations'],
+            zones['l1_idx'], zones['l1_h'], zones['l4_h']):
+        is_sel = (date == selected_date)
+        shapes.append(dict(type="rect", x0=date, x1=x1, y0=y0, y1=y1,
+                           fillcolor=CYAN if (is_124 and violations == 0) else ORANGE, line=dict(width=3 if is_sel else 1, color="white" if is_sel else None)))
+        
+        # Annotations: 1, 2, 4
+        annotations += [
+            dict(x=l1_x, y=l1_y, text="1", showarrow=False, font=dict(color="white")),
+            dict(x=date, y=y1, text="2", showarrow=False, font=dict(color="cyan", size=14), yshift=15),
+            dict(x=x1, y=l4_y, text="4", showarrow=False, font=dict(color="yellow", size=16), yshift=20),
+        ]
+
+    # Auto-Zoom Logic
+    xaxis = dict(rangeslider_visible=False)
+    if selected_date:
+        sel_dt = pd.to_datetime(selected_date)
+        xaxis['range'] = [sel_dt - pd.Timedelta(days=5), sel_dt + pd.Timedelta(days=20)]
+
+    # Traces and layout in a single Figure construction;
+    # uirevision keeps the user's pan/zoom across reruns for the same symbol
+    return go.Figure(data=traces, layout=dict(shapes=shapes, annotations=annotations, template="plotly_dark", height=600,
+                                              xaxis=xaxis, uirevision=ticker))
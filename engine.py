@@ -0,0 +1,215 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+from _indicators import fused_indicators
+from _scan_anchors import scan_anchors, scan_all
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+import hashlib
+import os
+import tempfile
+import time
+
+# --- BUILD ID ---
+DEFAULT_BUILD = "v5.0.0-Stable-Final"
+GIT_DIR = Path(__file__).resolve().parent / ".git"
+
+# Resolved once per process
+@lru_cache(maxsize=1)
+def get_commit_id():
+    # Read HEAD straight from .git; deploys without .git fall back
+    try:
+        head = (GIT_DIR / "HEAD").read_text().strip()
+        if head.startswith("ref: "):
+            ref = head[5:]
+            ref_path = GIT_DIR / ref
+            if ref_path.exists():
+                head = ref_path.read_text().strip()
+            else:
+                # Ref has been packed by git gc
+                head = next(line.split()[0] for line in (GIT_DIR / "packed-refs").read_text().splitlines()
+                            if line.endswith(" " + ref))
+        return head[:7]
+    except (OSError, StopIteration):
+        return DEFAULT_BUILD
+
+# --- PRESET UNIVERSE ---
+PSX_LIST = ("SYS", "LUCK", "HUBC", "ENGRO", "PPL", "OGDC", "MCB", "EFERT", "PIBTL")
+US_LIST = ("TSLA", "NVDA", "AAPL", "MSFT", "AMD", "ORCL")
+PRESET_TICKERS = {True: tuple(f"{s}.KA" for s in PSX_LIST), False: US_LIST}
+UNIVERSE = PRESET_TICKERS[True] + PRESET_TICKERS[False]
+
+# --- THE HUNTER ENGINE ---
+ALPHA_30 = 2 / 31
+ALPHA_50 = 2 / 51
+ATR_WINDOW = 14
+VOL_WINDOW = 20
+# Default 1-2-4 strategy: lookback, and leg-in / leg-out size multiples of the base candle
+PERIOD = "120d"
+LOOKBACKS = ("30d", "60d", "120d")
+LEG_IN_MULT = 1.5
+LEG_OUT_MULT = 2.0
+# Leg-out multiple that makes a zone a full 1-2-4 (cyan on the chart, eligible as best anchor / in the market scan)
+LEG_OUT_124_MULT = 4.0
+CACHE_DIR = Path(__file__).resolve().parent / ".yf_cache"
+CACHE_MAX_AGE = 1800
+
+# Compile (or load from numba's disk cache) every kernel at import, with the signatures
+# run_hunter_engine and run_market_scan use, so the first page load doesn't pay the JIT cost
+_warm = np.zeros(4)
+fused_indicators(_warm, _warm, _warm, ALPHA_30, ALPHA_50)
+scan_anchors(_warm, _warm, _warm, LEG_IN_MULT, LEG_OUT_MULT)
+scan_all(_warm[None], _warm[None], _warm[None], LEG_IN_MULT, LEG_OUT_124_MULT)
+
+def _disk_cached(name, fetch):
+    # Persistent tier under st.cache_data: a recent download survives app restarts.
+    # Files are named by a hash of the key, so a manual symbol can never steer the path out of CACHE_DIR
+    path = CACHE_DIR / f"{hashlib.sha1(name.encode()).hexdigest()}.pkl"
+    try:
+        if time.time() - path.stat().st_mtime < CACHE_MAX_AGE:
+            return pd.read_pickle(path)
+    except Exception:
+        pass  # missing, unreadable or pickled by another pandas version: treat as a miss
+    df = fetch()
+    if not df.empty:
+        # Written beside the target and swapped in, so a concurrent session never reads a partial pickle;
+        # a read-only or full disk only skips the persistent tier
+        tmp = None
+        try:
+            CACHE_DIR.mkdir(exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+            os.close(fd)
+            df.to_pickle(tmp)
+            os.replace(tmp, path)
+        except OSError:
+            if tmp is not None:
+                Path(tmp).unlink(missing_ok=True)
+    return df
+
+@st.cache_resource(show_spinner=False)
+def _ticker(ticker_str):
+    # Live Ticker objects (and their resolved metadata) are reused across reruns.
+    # yfinance is imported on the first network fetch, not at page load (disk-cache hits never need it)
+    import yfinance as yf
+    return yf.Ticker(ticker_str)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _fetch_history(ticker_str, period, interval, day):
+    # Reruns within the hour skip the network entirely; `day` only keys the cache so a new session refetches
+    return _disk_cached(f"{ticker_str}_{period}_{interval}",
+                        lambda: _ticker(ticker_str).history(period=period, interval=interval))
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _fetch_batch(tickers, period, day):
+    # One multi-symbol request for the whole preset list
+    def download():
+        import yfinance as yf
+        return yf.download(" ".join(tickers), period=period, interval="1d", group_by="ticker", threads=True, progress=False)
+    return _disk_cached(f"batch_{'-'.join(tickers)}_{period}", download)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _prefetch_universe(tickers, period, day):
+    # Split the single batch download into per-symbol frames, dropping days a symbol didn't trade
+    bulk = _fetch_batch(tickers, period, day)
+    return {t: bulk[t].dropna(how="all") for t in tickers if t in bulk.columns.get_level_values(0)}
+
+def _tail_mean(x, window):
+    # Last value of rolling(window).mean()
+    return float(x[-window:].mean()) if x.size >= window else np.nan
+
+def _compute_indicators(high, low, close, volume):
+    # EMA30, EMA50, bar size and True Range come out of one fused pass; ATR and volume average only need the tail
+    ema30, ema50, size, tr = fused_indicators(high, low, close, ALPHA_30, ALPHA_50)
+    return ema30, ema50, size, tr, _tail_mean(tr, ATR_WINDOW), _tail_mean(volume, VOL_WINDOW)
+
+@st.cache_data(ttl=900, show_spinner="Hunter searching…")
+def run_hunter_engine(symbol, is_psx, period=PERIOD, leg_in_mult=LEG_IN_MULT, leg_out_mult=LEG_OUT_MULT):
+    ticker_str = f"{symbol}.KA" if is_psx else symbol
+    # Presets come out of the prefetched universe; manual symbols (or batch misses) fetch on their own
+    day = date.today().isoformat()
+    df = _prefetch_universe(UNIVERSE, PERIOD, day).get(ticker_str) if ticker_str in UNIVERSE else None
+    if df is None or df.empty:
+        df = _fetch_history(ticker_str, PERIOD, "1d", day)
+    
+    if df.empty: return None, {}, None
+    
+    # Technical Indicators on the full PERIOD history (kept as arrays; only the EMAs are written back for the chart)
+    # An owned (writable) block, so the kernels hit the signatures warmed at import instead of compiling read-only variants
+    high, low, close, volume = df[['High', 'Low', 'Close', 'Volume']].to_numpy(dtype=np.float64, copy=True).T
+    ema30, ema50, size, tr, atr, vol_avg = _compute_indicators(high, low, close, volume)
+    df['EMA30'], df['EMA50'] = ema30, ema50
+    
+    idx = df.index
+    # Zones are only searched within the lookback `period`
+    start = 0
+    if period != PERIOD:
+        start = int(idx.searchsorted(idx[-1] - pd.Timedelta(days=int(period.rstrip("d")))))
+
+    # Scan for 1-2-4 patterns (leg-in >= 1.5x base, leg-out >= 2x base) in the compiled kernel,
+    # on float64 bars so threshold ties resolve exactly as on the quoted prices
+    bases, pristine_mask, violation_counts = scan_anchors(size[start:], high[start:], low[start:], leg_in_mult, leg_out_mult)
+    bases += start
+    # Leg sizes gathered once for the surviving bases only (the same sizes the scan admitted them on)
+    leg_in, leg_base, leg_out = size[bases-1], size[bases], size[bases+1]
+    is_124_mask = leg_out >= LEG_OUT_124_MULT*leg_base
+    # Ratios only for survivors (the kernel already rejected zero-size bases), rounded in one vectorized pass
+    ratio_in, ratio_out = (np.round(leg / leg_base, 1).tolist() for leg in (leg_in, leg_out))
+    n_bars = len(df)
+    # Zones come back column-wise (one aligned array/list per field), gathered positionally from the scan output
+    zones = {
+        "Date": idx[bases].strftime('%Y-%m-%d').tolist(),
+        "High (Ceiling)": high[bases],
+        "Low (Floor)": low[bases],
+        "Type": np.where(pristine_mask, "PRISTINE", "VIOLATED"),
+        "Ratio": [f"1:{r1} | 4:{r4}" for r1, r4 in zip(ratio_in, ratio_out)],
+        "is_124": is_124_mask,
+        "Age": n_bars - (bases+1),
+        "Violations": violation_counts,
+        "l1_idx": idx[bases-1].tolist(), "l4_idx": idx[bases+1].tolist(),
+        "l1_h": high[bases-1], "l4_h": high[bases+1],
+    }
+
+    # Best anchor = oldest pristine 1-2-4 (first hit, since zones are in date order);
+    # a single argmax pass, and a False at the winning slot means there is none
+    anchors = pristine_mask & is_124_mask
+    best = int(anchors.argmax()) if anchors.size else 0
+    ctx = {
+        "best_anchor": best if anchors.size and anchors[best] else None,
+        "price": close[-1],
+        "ema_status": "BULLISH" if ema30[-1] > ema50[-1] else "BEARISH",
+        "tr_atr": tr[-1] / atr,
+        "vol_ratio": volume[-1] / vol_avg if vol_avg > 0 else 0
+    }
+    return df, zones, ctx
+
+@st.cache_data(ttl=900, show_spinner=False)
+def run_market_scan(is_psx):
+    frames = _prefetch_universe(UNIVERSE, PERIOD, date.today().isoformat())
+    tickers = [t for t in PRESET_TICKERS[is_psx] if t in frames and not frames[t].empty]
+    if not tickers: return None
+    
+    # Stack the preset list into (tickers, bars) matrices, right-aligned and NaN-padded
+    # so symbols with fewer trading days still line up on their latest bar
+    n_bars = max(len(frames[t]) for t in tickers)
+    high_mat = np.full((len(tickers), n_bars), np.nan)
+    low_mat = np.full((len(tickers), n_bars), np.nan)
+    for k, t in enumerate(tickers):
+        high_mat[k, n_bars - len(frames[t]):], low_mat[k, n_bars - len(frames[t]):] = \
+            frames[t][['High', 'Low']].to_numpy(dtype=np.float64).T
+    # Bar sizes for the whole matrix
+    counts, oldest = scan_all(high_mat, low_mat, high_mat - low_mat, LEG_IN_MULT, LEG_OUT_124_MULT)
+    return pd.DataFrame({
+        "Symbol": [t.removesuffix(".KA") for t in tickers],
+        "Pristine 1-2-4": counts,
+        "Oldest Anchor": [frames[t].index[i - (n_bars - len(frames[t]))].strftime('%Y-%m-%d') if i >= 0 else "-"
+                          for t, i in zip(tickers, oldest)],
+    })
+
+def clear_caches():
+    # Force fresh downloads: drop the in-process caches and the on-disk tier beneath them
+    for cached in (_fetch_history, _fetch_batch, _prefetch_universe, run_hunter_engine, run_market_scan):
+        cached.clear()
+    for pattern in ("*.pkl", "*.tmp"):
+        for path in CACHE_DIR.glob(pattern):
+            path.unlink(missing_ok=True)
@@ -1,13 +1,84 @@
 import customtkinter as ctk
-import yfinance as yf
-import pandas as pd
+from functools import lru_cache
+import threading
+from datetime import datetime
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from _indicators import dual_ewma
+
+ALPHA_20 = 2 / 21
+ALPHA_50 = 2 / 51
+PSX_SHARIA = ("SYS", "LUCK", "HUBC", "ENGRO", "PPL")
+NYSE_TOP = ("TSM", "V", "ORCL", "BRK-B", "JPM")
+PRESETS = tuple(f"{s}.KA" for s in PSX_SHARIA) + NYSE_TOP
+
+# Compile (or load from numba's disk cache) the EMA kernel at startup
+dual_ewma(np.zeros(2), ALPHA_20, ALPHA_50)
 
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
+@lru_cache(maxsize=None)
+def _ticker(ticker_str):
+    # One Ticker object per symbol, reused across clicks
+    import yfinance as yf
+    return yf.Ticker(ticker_str)
+
+def _cache_hour():
+    # Key that rolls over on the clock hour: repeat clicks hit memory, quotes are never more than an hour old
+    return datetime.now().strftime("%Y-%m-%d-%H")
+
+@lru_cache(maxsize=1)
+def _download_presets(hour):
+    # Both sidebar lists in one threaded download; `hour` only keys the cache.
+    # yfinance is imported here (first run on the startup warm-up thread) so it stays off the window's first paint
+    import yfinance as yf
+    bulk = yf.download(" ".join(PRESETS), period="60d", interval="1d", group_by="ticker", threads=True, progress=False)
+    return {t: bulk[t].dropna(how="all") for t in PRESETS if t in bulk.columns.get_level_values(0)}
+
+_PREFETCH_LOCK = threading.Lock()
+
+def _prefetch_presets(hour):
+    # The warm-up thread and sidebar clicks share one in-flight download: a click during warm-up waits for it
+    with _PREFETCH_LOCK:
+        return _download_presets(hour)
+
+@lru_cache(maxsize=32)
+def _fetch_history(ticker_str, period, hour):
+    # Manual symbols: one network round trip per symbol per hour
+    return _ticker(ticker_str).history(period=period, interval="1d")
+
+@lru_cache(maxsize=32)
+def _analyze(ticker_str, hour):
+    # Fetch, indicators and setup checks memoized per symbol per hour, so a repeat click only redraws (None = no data).
+    # Sidebar presets come out of the batch download; manual symbols (or batch misses) fetch on their own
+    df = _prefetch_presets(hour).get(ticker_str) if ticker_str in PRESETS else None
+    if df is None or df.empty:
+        df = _fetch_history(ticker_str, "60d", hour)
+    if df.empty:
+        return None
+
+    # Technical Calcs
+    open_, high, low, close = df[['Open', 'High', 'Low', 'Close']].to_numpy(dtype=np.float64).T
+    ema20, ema50 = dual_ewma(close, ALPHA_20, ALPHA_50)
+    df['EMA20'], df['EMA50'] = ema20, ema50
+
+    # 1-2-4 Logic (only the last three bar sizes are ever read)
+    leg_in, base, leg_out = high[-3:] - low[-3:]
+
+    # White Area
+    prev_7d_high = float(high[-8:-1].max())
+
+    return df, {
+        # Pulse Check
+        "pulse": ema20[-1] > ema50[-1] and close[-1] > open_[-1],
+        "ratio_pass": (leg_in >= 2 * base) and (leg_out >= 4 * base),
+        "white_area_pass": low[-1] > prev_7d_high,
+        "prev_7d_high": prev_7d_high,
+        "base_zone": (float(low[-2]), float(high[-2])),
+    }
+
 class StockScreenerApp(ctk.CTk):
     def __init__(self):
         super().__init__()
@@ -40,8 +111,7 @@ class StockScreenerApp(ctk.CTk):
         self.psx_label = ctk.CTkLabel(self.sidebar, text="PSX SHARIA TOP 5", font=("Arial", 12, "bold"), text_color="gray")
         self.psx_label.pack(pady=(20, 5))
         
-        psx_sharia = ["SYS", "LUCK", "HUBC", "ENGRO", "PPL"]
-        for stock in psx_sharia:
+        for stock in PSX_SHARIA:
             btn = ctk.CTkButton(self.sidebar, text=stock, fg_color="transparent", border_width=1, 
                                  command=lambda s=stock: self.quick_analyze(s, True))
             btn.pack(pady=2, padx=20)
@@ -50,8 +120,7 @@ class StockScreenerApp(ctk.CTk):
         self.nyse_label = ctk.CTkLabel(self.sidebar, text="NYSE TOP 5", font=("Arial", 12, "bold"), text_color="gray")
         self.nyse_label.pack(pady=(20, 5))
         
-        nyse_stocks = ["TSM", "V", "ORCL", "BRK-B", "JPM"]
-        for stock in nyse_stocks:
+        for stock in NYSE_TOP:
             btn = ctk.CTkButton(self.sidebar, text=stock, fg_color="transparent", border_width=1, 
                                  command=lambda s=stock: self.quick_analyze(s, False))
             btn.pack(pady=2, padx=20)
@@ -66,6 +135,9 @@ class StockScreenerApp(ctk.CTk):
         self.canvas_frame = ctk.CTkFrame(self.main_frame)
         self.canvas_frame.pack(fill="both", expand=True, padx=10, pady=10)
 
+        # Warm the preset batch off the UI thread so the first sidebar click doesn't stall on the network
+        threading.Thread(target=_prefetch_presets, args=(_cache_hour(),), daemon=True).start()
+
     def run_manual_analysis(self):
         symbol = self.ticker_entry.get().upper()
         self.quick_analyze(symbol, self.psx_var.get())
@@ -73,46 +145,31 @@ class StockScreenerApp(ctk.CTk):
     def quick_analyze(self, symbol, is_psx):
         ticker_str = f"{symbol}.KA" if is_psx else symbol
         try:
-            stock = yf.Ticker(ticker_str)
-            df = stock.history(period="60d")
-            
-            if df.empty:
+            result = _analyze(ticker_str, _cache_hour())
+            if result is None:
                 self.result_box.delete("1.0", "end")
                 self.result_box.insert("end", f"Error: {ticker_str} not found.")
                 return
-
-            # Technical Calcs
-            df['EMA20'] = df['Close'].ewm(span=20, adjust=False).mean()
-            df['EMA50'] = df['Close'].ewm(span=50, adjust=False).mean()
-            df['Size'] = df['High'] - df['Low']
-            
-            # 1-2-4 Logic
-            leg_in, base, leg_out = df['Size'].iloc[-3], df['Size'].iloc[-2], df['Size'].iloc[-1]
-            ratio_pass = (leg_in >= 2 * base) and (leg_out >= 4 * base)
-            
-            # White Area
-            prev_7d_high = df['High'].iloc[-8:-1].max()
-            white_area_pass = df['Low'].iloc[-1] > prev_7d_high
-
-            # Pulse Check
-            pulse = df['EMA20'].iloc[-1] > df['EMA50'].iloc[-1] and df['Close'].iloc[-1] > df['Open'].iloc[-1]
+            df, checks = result
+            pulse, ratio_pass, white_area_pass = checks['pulse'], checks['ratio_pass'], checks['white_area_pass']
+            base_low, base_high = checks['base_zone']
 
             self.result_box.delete("1.0", "end")
             report = f"STARK DASHBOARD REPORT: {ticker_str}\n" + "="*40 + "\n"
             report += f"PULSE TREND:  {'✅ BULLISH' if pulse else '❌ NEUTRAL/BEAR'}\n"
             report += f"1-2-4 RATIO:  {'✅ DETECTED' if ratio_pass else '❌ FAILED'}\n"
             report += f"WHITE AREA:   {'✅ CLEAN' if white_area_pass else '❌ OVERLAP'}\n"
-            report += f"ZONE RANGE:   {df['Low'].iloc[-2]:.2f} - {df['High'].iloc[-2]:.2f}\n"
+            report += f"ZONE RANGE:   {base_low:.2f} - {base_high:.2f}\n"
             report += "="*40 + "\n"
             report += f"VERDICT: {'🟢 SAFE TO INVEST' if (pulse and ratio_pass and white_area_pass) else '🔴 AVOID - SETUP INCOMPLETE'}"
             
             self.result_box.insert("end", report)
-            self.plot_chart(df, symbol, prev_7d_high)
+            self.plot_chart(df, symbol, checks['prev_7d_high'], checks['base_zone'])
 
         except Exception as e:
             self.result_box.insert("end", f"System Error: {str(e)}")
 
-    def plot_chart(self, df, symbol, white_barrier):
+    def plot_chart(self, df, symbol, white_barrier, base_zone):
         for widget in self.canvas_frame.winfo_children():
             widget.destroy()
 
@@ -129,7 +186,7 @@ class StockScreenerApp(ctk.CTk):
         ax1.plot(df.index, df['EMA50'], color='#ffcc00', label='Trend')
         ax1.axhline(white_barrier, color='white', linestyle='--', alpha=0.4, label="Maturity Line")
         
-        base_low, base_high = df['Low'].iloc[-2], df['High'].iloc[-2]
+        base_low, base_high = base_zone
         ax1.axhspan(base_low, base_high, color='lime', alpha=0.15, label="Demand Zone")
 
         ax1.legend(loc='upper left', fontsize=8, labelcolor='white', facecolor='#1e1e1e')